@@ -0,0 +1,142 @@
+import os
+import stat
+import tempfile
+import pandas as pd
+import numpy as np
+import logging
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from typing import Optional
+
+logging.basicConfig(
+    level = logging.INFO,
+    format = '%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def read_csv(file_path: str,
+             patient_ids: Optional[list] = None,
+             usecols: Optional[list] = None,
+             date_cols: Optional[list] = None,
+             categorical_cols: Optional[list] = None,
+             cache: bool = False) -> pd.DataFrame:
+    """
+    Reads a Flatiron CSV file with the multithreaded PyArrow reader, optionally restricting rows to a set of PatientIDs.
+
+    If cache is True, the first read of a CSV file writes a Parquet copy next to it (file_path + '.parquet'). Later reads 
+    load the Parquet copy instead of re-parsing the CSV, as long as the CSV file's size and modification time match those 
+    recorded in the copy. Caching is off by default.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to CSV file
+    patient_ids : list-like or pa.Array, optional
+        PatientIDs to keep (e.g., list, pd.Series, pd.Index, or a pre-built pa.Array reused across calls). Rows for other patients 
+        are dropped from the Arrow table before conversion to pandas. If None, all rows are returned
+    usecols : list, optional
+        Columns to read. If None, all columns are read
+    date_cols : list, optional
+        Columns parsed to datetime64[ns] by the reader
+    categorical_cols : list, optional
+        Columns returned as pd.Categorical. These are dictionary-encoded in Arrow, so only unique values become Python objects
+    cache : bool, default False
+        If True, read from and write to the Parquet copy of the CSV file. If False, the CSV file is parsed and nothing is written
+
+    Returns
+    -------
+    pd.DataFrame
+
+    Notes
+    -----
+    The Parquet copy always holds every column of the CSV file, so it contains the same patient data as the CSV file and is 
+    never removed by this function. Only enable caching for data directories where an additional copy of the data is 
+    acceptable. If the copy cannot be written (e.g., read-only directory), a warning is logged and the CSV file is parsed 
+    on every call.
+
+    The copy is only used when the CSV file's size and modification time (in nanoseconds) both equal the values stored 
+    when it was written. Any other CSV file, including one replaced with an older modification time (e.g., by unzip or 
+    cp -p), is re-parsed and the copy rewritten.
+    """
+    date_cols = date_cols or []
+    cache_path = f'{file_path}.parquet'
+
+    # Identify the exact CSV file the Parquet copy was made from
+    source_stat = os.stat(file_path)
+    source_metadata = {
+        b'source_size': str(source_stat.st_size).encode(),
+        b'source_mtime_ns': str(source_stat.st_mtime_ns).encode()
+    }
+
+    table = _read_cache(cache_path, source_metadata, usecols) if cache else None
+
+    if table is not None:
+        # Cached copy may have been written by a call that did not request these date columns
+        for col in date_cols:
+            if not pa.types.is_timestamp(table.schema.field(col).type):
+                table = table.set_column(table.schema.get_field_index(col), col, pc.cast(table[col], pa.timestamp('ns')))
+    else:
+        convert_options = pa_csv.ConvertOptions(
+            column_types = {col: pa.timestamp('ns') for col in date_cols},
+            strings_can_be_null = True
+        )
+        table = pa_csv.read_csv(file_path, convert_options = convert_options)
+
+        if cache:
+            _write_cache(table.replace_schema_metadata({**(table.schema.metadata or {}), **source_metadata}), 
+                         cache_path,
+                         mode = stat.S_IMODE(source_stat.st_mode) & 0o666)
+
+        if usecols is not None:
+            table = table.select(usecols)
+
+    if patient_ids is not None:
+        # pandas objects and arrays convert to Arrow without an intermediate Python list
+        id_type = table.schema.field('PatientID').type
+        if isinstance(patient_ids, pa.Array):
+            value_set = patient_ids.cast(id_type)
+        else:
+            value_set = pa.array(patient_ids if isinstance(patient_ids, (pd.Series, pd.Index, np.ndarray)) else list(patient_ids), type = id_type)
+        table = table.filter(pc.is_in(table['PatientID'], value_set = value_set))
+
+    return table.to_pandas(categories = categorical_cols)
+
+def _read_cache(cache_path: str, source_metadata: dict, usecols: Optional[list]) -> Optional[pa.Table]:
+    """
+    Reads the Parquet copy at cache_path if it was written from a CSV file matching source_metadata; otherwise returns None.
+    """
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+        if any(metadata.get(key) != value for key, value in source_metadata.items()):
+            logging.info(f"Parquet cache {cache_path} does not match its CSV file and will be rewritten")
+            return None
+        return pq.read_table(cache_path, columns = usecols)
+    except Exception as e:
+        logging.warning(f"Could not read Parquet cache {cache_path}, parsing CSV file instead: {e}")
+        return None
+
+def _write_cache(table: pa.Table, cache_path: str, mode: int) -> None:
+    """
+    Writes table to cache_path through a uniquely named temporary file, so concurrent writers never interleave and an 
+    interrupted write never leaves a partial cache behind. The cache gets permission bits mode, which callers set from the 
+    source CSV file so that everyone who can read the CSV file can read its cache.
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir = os.path.dirname(cache_path) or '.', suffix = '.tmp')
+        os.close(fd)
+        pq.write_table(table, tmp_path, compression = 'zstd')
+        # mkstemp creates the file as 0600; match the CSV file instead
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logging.warning(f"Could not write Parquet cache for {cache_path}: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -5,11 +5,96 @@ import math
 import re 
 from typing import Optional
 
+from .io_utils import read_csv
+
 logging.basicConfig(
     level = logging.INFO,                                 
     format = '%(asctime)s - %(levelname)s - %(message)s'  
 )
 
+def _category_codes(mapping: dict, dtype: pd.CategoricalDtype) -> dict:
+    """
+    Converts a recoding mapping into a lookup of each original value to the code of its recoded value in dtype.
+    """
+    return {key: dtype.categories.get_loc(value) for key, value in mapping.items()}
+
+def _recode_categorical(series: pd.Series, codes: dict, dtype: pd.CategoricalDtype, default_code: int = -1) -> pd.Categorical:
+    """
+    Recodes a categorical Series by looking up the codes of its categories rather than every row. Missing values and values not found in codes get default_code (-1 is NaN).
+    """
+    # Lookup table from source category code to target code, with a trailing default so that missing codes (-1) index to default_code
+    lookup = np.array([codes.get(c, default_code) for c in series.cat.categories] + [default_code], dtype = np.int8)
+    return pd.Categorical.from_codes(lookup[series.cat.codes.to_numpy()], dtype = dtype)
+
+def _map_patients(patient_ids: pd.Series, values: pd.Series) -> pd.Series:
+    """
+    Looks up values, a Series indexed by unique PatientID, for every row of patient_ids. Categorical PatientIDs are looked up 
+    once per category and broadcast to rows by code. PatientIDs not found in values are missing.
+    """
+    if isinstance(patient_ids.dtype, pd.CategoricalDtype):
+        per_category = values.reindex(patient_ids.cat.categories).array
+        return pd.Series(per_category.take(patient_ids.cat.codes.to_numpy(), allow_fill = True), index = patient_ids.index, name = values.name)
+    return patient_ids.map(values)
+
+def _psa_kinetics(days: np.ndarray, psa_dx: np.ndarray, psa_met: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes PSA doubling time (months) and PSA velocity (ng/mL/month) from first diagnosis to metastatic diagnosis. 
+
+    Inputs are float64 arrays of days from first to metastatic diagnosis and PSA at each time point. Rows with 30 or fewer days, 
+    missing values, or non-positive PSA are NaN; doubling time is also NaN unless PSA rose. 
+    """
+    # NaN compares False, so missing days (e.g., missing DiagnosisDate) and missing PSA are excluded
+    eligible = (days > 30) & (psa_dx > 0) & (psa_met > 0)
+    rising = eligible & (psa_met > psa_dx) # Doubling time formula only makes sense for rising numbers 
+    months = days/30
+
+    psa_doubling = np.full(days.shape, np.nan)
+    psa_doubling[rising] = (months[rising] * math.log(2))/(np.log(psa_met[rising]) - np.log(psa_dx[rising]))
+
+    psa_velocity = np.full(days.shape, np.nan)
+    psa_velocity[eligible] = (psa_met[eligible] - psa_dx[eligible])/months[eligible]
+
+    return psa_doubling, psa_velocity
+
+def _closest_ecog_rows(codes: np.ndarray, days: np.ndarray, ecog: np.ndarray, n_patients: int) -> np.ndarray:
+    """
+    Returns, for each of n_patients patient codes, the position of the row with the ECOG closest to index date, with the 
+    highest ECOG selected in ties, or -1 for patients without an ECOG. 
+
+    Inputs are arrays of patient codes, days from index date, and non-missing ECOG values.
+    """
+    # Sort by patient, then distance from index date, then highest ECOG, so the first row of each patient is the one selected
+    order = np.lexsort((-ecog, np.abs(days), codes))
+    sorted_codes = codes[order]
+    is_first = np.ones(len(order), dtype = bool)
+    is_first[1:] = sorted_codes[1:] != sorted_codes[:-1]
+
+    rows = np.full(n_patients, -1, dtype = np.int64)
+    rows[sorted_codes[is_first]] = order[is_first]
+    return rows
+
+def _newly_gte2(codes: np.ndarray, dates: np.ndarray, ecog: np.ndarray, n_patients: int) -> np.ndarray:
+    """
+    Returns 1 for each of n_patients patient codes whose most recent ECOG is ≥2 and any earlier ECOG was 0 or 1, 0 for other 
+    patients with an ECOG, and -1 for patients without an ECOG. 
+
+    Inputs are arrays of patient codes, ECOG dates as int64, and ECOG values with missing values as -1.
+    """
+    # Stable sort by patient then date, so the last row of each patient is the most recent ECOG (latest in file order on date ties)
+    order = np.lexsort((dates, codes))
+    sorted_codes = codes[order]
+    is_last = np.ones(len(order), dtype = bool)
+    is_last[:-1] = sorted_codes[1:] != sorted_codes[:-1]
+    last = order[is_last]
+
+    low = (ecog == 0) | (ecog == 1)
+    n_low = np.bincount(codes[low], minlength = n_patients)
+    prior_low = (n_low[codes[last]] - low[last]) > 0
+
+    out = np.full(n_patients, -1, dtype = np.int8)
+    out[codes[last]] = (ecog[last] >= 2) & prior_low
+    return out
+
 class DataProcessorProstate:
 
     GROUP_STAGE_MAPPING = {        
@@ -82,6 +167,19 @@ class DataProcessorProstate:
         'Unknown / Not documented': 'unknown'
     }
 
+    # Output categories for recoded stage and Gleason variables (ordered, with 'unknown' last), with lookups from original value to output code 
+    GROUP_STAGE_DTYPE = pd.CategoricalDtype(['I', 'II', 'III', 'IV', 'unknown'], ordered = True)
+    T_STAGE_DTYPE = pd.CategoricalDtype(['T1', 'T2', 'T3', 'T4', 'unknown'], ordered = True)
+    N_STAGE_DTYPE = pd.CategoricalDtype(['N0', 'N1', 'unknown'], ordered = True)
+    M_STAGE_DTYPE = pd.CategoricalDtype(['M0', 'M1', 'unknown'], ordered = True)
+    GLEASON_DTYPE = pd.CategoricalDtype([1, 2, 3, 4, 5, 'unknown'], ordered = True)
+
+    _GROUP_STAGE_CODES = _category_codes(GROUP_STAGE_MAPPING, GROUP_STAGE_DTYPE)
+    _T_STAGE_CODES = _category_codes(T_STAGE_MAPPING, T_STAGE_DTYPE)
+    _N_STAGE_CODES = _category_codes(N_STAGE_MAPPING, N_STAGE_DTYPE)
+    _M_STAGE_CODES = _category_codes(M_STAGE_MAPPING, M_STAGE_DTYPE)
+    _GLEASON_CODES = _category_codes(GLEASON_MAPPING, GLEASON_DTYPE)
+
     STATE_REGIONS_MAPPING = {
         'ME': 'northeast', 
         'NH': 'northeast',
@@ -137,6 +235,23 @@ class DataProcessorProstate:
         'PR': 'unknown'
     }
 
+    REGION_DTYPE = pd.CategoricalDtype(['midwest', 'northeast', 'south', 'unknown', 'west'])
+    _REGION_CODES = _category_codes(STATE_REGIONS_MAPPING, REGION_DTYPE)
+
+    BRCA_POSITIVE_VALUES = frozenset({
+        'BRCA1 mutation identified',
+        'BRCA2 mutation identified',
+        'Both BRCA1 and BRCA2 mutations identified',
+        'BRCA mutation NOS'
+    })
+
+    BRCA_NEGATIVE_VALUES = frozenset({
+        'No BRCA mutation',
+        'Genetic Variant Favor Polymorphism'
+    })
+
+    ECOG_DTYPE = pd.CategoricalDtype([0, 1, 2, 3, 4], ordered = True)
+
     INSURANCE_MAPPING = {
         'Commercial Health Plan': 'commercial',
         'Medicare': 'medicare',
@@ -423,7 +538,16 @@ class DataProcessorProstate:
         r'^C790|^C791|^C792|^C796|^C798|^C799|^C80': 'other_met'
     }
 
-    def __init__(self):
+    def __init__(self, cache: bool = False):
+        """
+        Parameters
+        ----------
+        cache : bool, default False
+            If True, each input CSV file is cached as a Parquet copy holding all of its columns next to it 
+            (file_path + '.parquet') so later reads skip CSV parsing. The copy contains the same patient data as the CSV 
+            file and is not removed automatically; see io_utils.read_csv
+        """
+        self.cache = cache
         self.enhanced_df = None
         self.demographics_df = None
         self.practice_df = None 
@@ -478,21 +602,21 @@ class DataProcessorProstate:
         pd.DataFrame or None 
             - PatientID : object
                 unique patient identifier
-            - GroupStage_mod : category
+            - GroupStage_mod : category, ordered
                 consolidated overall staging (I-IV and unknown) at time of first diagnosis
-            - TStage_mod : category
+            - TStage_mod : category, ordered
                 consolidated tumor staging (T1-T4 and unknown) at time of first diagnosis
-            - NStage_mod : category
+            - NStage_mod : category, ordered
                 consolidated lymph node staging (N0, N1, and unknown) at time of first diagnosis
-            - MStage_mod : category
+            - MStage_mod : category, ordered
                 consolidated metastasis staging (M0, M1, and unknown) at time of first diagnosis
-            - GleasonScore_mod : category
+            - GleasonScore_mod : category, ordered
                 consolidated Gleason scores into Grade Groups (1-5 and unknown) at time of first diagnosis 
             - Histology : category
                 histology (adenocarcinoma and NOS) at time of initial diagnosis 
             - days_diagnosis_to_met : float
                 days from first diagnosis to metastatic disease 
-            - met_diagnosis_year : category
+            - met_diagnosis_year : Int16
                 year of metastatic diagnosis 
             - TreatmentType_mod : cateogry
                 consolidation primary treatments (surgery, radiation, and other), if Enhanced_MetPC_PrimaryTreatment.csv file is included as parameter
@@ -540,6 +664,7 @@ class DataProcessorProstate:
         Output handling: 
         - Duplicate PatientIDs are logged as warnings if found but retained in output
         - Processed DataFrame is stored in self.enhanced_df
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if patient_ids is not None:
@@ -553,7 +678,7 @@ class DataProcessorProstate:
                 raise ValueError("index_date_df must contain a 'PatientID' column")
             if not index_date_column or index_date_column not in index_date_df.columns:
                 raise ValueError('index_date_column not found in index_date_df')
-            if index_date_df['PatientID'].duplicated().any():
+            if not index_date_df['PatientID'].is_unique:
                 raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
             
             index_date_df = index_date_df.copy()
@@ -566,25 +691,27 @@ class DataProcessorProstate:
             index_date_column = f'imported_{index_date_column}'
 
         try:
-            df = pd.read_csv(file_path)
+            # Restrict the read to the PatientIDs of interest so other rows are never converted to pandas
+            if index_date_column == 'MetDiagnosisDate' and patient_ids is not None:
+                filter_ids = patient_ids
+            elif index_date_column != 'MetDiagnosisDate' and index_date_df is not None:
+                filter_ids = index_date_df['PatientID']
+            else:
+                filter_ids = None
+
+            # Date columns are parsed by the PyArrow reader rather than in a separate pd.to_datetime pass
+            date_cols = ['DiagnosisDate', 'MetDiagnosisDate', 'CRPCDate']
+            df = read_csv(file_path, patient_ids = filter_ids, date_cols = date_cols, cache = self.cache)
             logging.info(f"Successfully read Enhanced_MetProstate.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
             # Case 1: Using default MetDiagnosisDate with specific patients
             if index_date_column == 'MetDiagnosisDate' and patient_ids is not None:
-                logging.info(f"Filtering for {len(patient_ids)} specific PatientIDs")
-                df = df[df['PatientID'].isin(patient_ids)]
-                logging.info(f"Successfully filtered Enhanced_MetProstate.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
+                logging.info(f"Filtered for {len(patient_ids)} specific PatientIDs while reading")
 
             # Case 2: Using custom index date with index_date_df
             elif index_date_column != 'MetDiagnosisDate' and index_date_df is not None:
-                index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
-                df = df[df.PatientID.isin(index_date_df.PatientID)]
-                df = pd.merge(
-                    df,
-                    index_date_df[['PatientID', index_date_column]],
-                    on = 'PatientID',
-                    how = 'left'
-                )
+                index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column], cache = True)
+                df[index_date_column] = _map_patients(df['PatientID'], index_date_df.set_index('PatientID')[index_date_column])
                 logging.info(f"Successfully merged Enhanced_MetProstate.csv df with index_date_df resulting in shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
             # Case 3: Using default MetDiagnosisDate with all patients (no filtering)
@@ -596,7 +723,7 @@ class DataProcessorProstate:
                 logging.error("If index_date_column is not 'MetDiagnosisDate', an index_date_df must be provided")
                 return None
         
-            # Convert categorical columns
+            # Convert categorical columns; the category codes of the stage columns drive the recoding below
             categorical_cols = ['GroupStage',
                                 'TStage', 
                                 'NStage',
@@ -604,27 +731,20 @@ class DataProcessorProstate:
                                 'GleasonScore', 
                                 'Histology']
             
-            df[categorical_cols] = df[categorical_cols].astype('category')
+            # Cast column by column to avoid building a temporary sub-frame
+            for col in categorical_cols:
+                df[col] = df[col].astype('category')
 
             # Recode stage variables using class-level mapping and create new column
-            df['GroupStage_mod'] = df['GroupStage'].map(self.GROUP_STAGE_MAPPING).astype('category')
-            df['TStage_mod'] = df['TStage'].map(self.T_STAGE_MAPPING).astype('category')
-            df['NStage_mod'] = df['NStage'].map(self.N_STAGE_MAPPING).astype('category')
-            df['MStage_mod'] = df['MStage'].map(self.M_STAGE_MAPPING).astype('category')
-            df['GleasonScore_mod'] = df['GleasonScore'].map(self.GLEASON_MAPPING).astype('category')
-
-            # Drop original stage variables if specified
-            if drop_stages:
-                df = df.drop(columns=['GroupStage', 'TStage', 'NStage', 'MStage', 'GleasonScore'])
-
-            # Convert date columns to datetime
-            date_cols = ['DiagnosisDate', 'MetDiagnosisDate', 'CRPCDate']
-            for col in date_cols:
-                df[col] = pd.to_datetime(df[col])
+            df['GroupStage_mod'] = _recode_categorical(df['GroupStage'], self._GROUP_STAGE_CODES, self.GROUP_STAGE_DTYPE)
+            df['TStage_mod'] = _recode_categorical(df['TStage'], self._T_STAGE_CODES, self.T_STAGE_DTYPE)
+            df['NStage_mod'] = _recode_categorical(df['NStage'], self._N_STAGE_CODES, self.N_STAGE_DTYPE)
+            df['MStage_mod'] = _recode_categorical(df['MStage'], self._M_STAGE_CODES, self.M_STAGE_DTYPE)
+            df['GleasonScore_mod'] = _recode_categorical(df['GleasonScore'], self._GLEASON_CODES, self.GLEASON_DTYPE)
 
             # Generate new time-based variables 
             df['days_diagnosis_to_met'] = (df['MetDiagnosisDate'] - df['DiagnosisDate']).dt.days
-            df['met_diagnosis_year'] = pd.Categorical(df['MetDiagnosisDate'].dt.year)
+            df['met_diagnosis_year'] = df['MetDiagnosisDate'].dt.year.astype('Int16')
 
             if primary_treatment_path is not None: 
                 try: 
@@ -632,7 +752,7 @@ class DataProcessorProstate:
                     logging.info(f"Successfully read Enhanced_MetPC_PrimaryTreatment.csv file with shape: {primary_treatment_df.shape} and unique PatientIDs: {(primary_treatment_df['PatientID'].nunique())}")
 
                     df = pd.merge(df,primary_treatment_df, on = 'PatientID', how = 'left')
-                    df['TreatmentDate'] = pd.to_datetime(df['TreatmentDate'])
+                    df['TreatmentDate'] = pd.to_datetime(df['TreatmentDate'], format = '%Y-%m-%d', cache = True)
                     df['days_diagnosis_to_primary_treatment'] = (df['TreatmentDate'] - df['DiagnosisDate']).dt.days
             
                     # For those with value <0, set to 0; otherwise, leave as is
@@ -652,62 +772,44 @@ class DataProcessorProstate:
 
             # Generate IsCRPC_index where 1 if CRPCDate is less than or equal to index date 
             # Calculate time from diagnosis to CRPC (presuming before metastatic diagnosis or index)
-            if index_date_column == "MetDiagnosisDate":
-                df['IsCRPC_index'] = np.where(df['CRPCDate'] <= df['MetDiagnosisDate'], 1, 0)
-                df['days_diagnosis_to_crpc'] = np.where(df['IsCRPC_index'] == 1,
-                                                        (df['CRPCDate'] - df['DiagnosisDate']).dt.days,
-                                                        np.nan)
-            else:
-                df['IsCRPC_index'] = np.where(df['CRPCDate'] <= df[index_date_column], 1, 0)
-                df['days_diagnosis_to_crpc'] = np.where(df['IsCRPC_index'] == 1,
-                                                        (df['CRPCDate'] - df['DiagnosisDate']).dt.days,
-                                                        np.nan)
-            
-            df = df.drop(columns = ['IsCRPC'])
+            # Dates are compared as int64 nanoseconds since epoch, where NaT is the minimum int64 value
+            nat = np.iinfo(np.int64).min
+            ns_per_day = 86_400_000_000_000
+            crpc = df['CRPCDate'].to_numpy(dtype = 'datetime64[ns]').view('i8')
+            index_date = df[index_date_column].to_numpy(dtype = 'datetime64[ns]').view('i8')
+            diagnosis = df['DiagnosisDate'].to_numpy(dtype = 'datetime64[ns]').view('i8')
+
+            is_crpc = (crpc != nat) & (index_date != nat) & (crpc <= index_date)
+            df['IsCRPC_index'] = pd.array(is_crpc.astype(np.int64), dtype = 'Int64')
+
+            days_to_crpc = np.full(len(df), np.nan)
+            has_days = is_crpc & (diagnosis != nat)
+            days_to_crpc[has_days] = (crpc[has_days] - diagnosis[has_days]) // ns_per_day
+            df['days_diagnosis_to_crpc'] = days_to_crpc
 
             num_cols = ['PSADiagnosis', 'PSAMetDiagnosis']
             for col in num_cols:
                 df[col] = pd.to_numeric(df[col], errors = 'coerce').astype('float')
 
-            # Calculating PSA doubling time in months 
-            df_doubling = (
-                df
-                .query('DiagnosisDate.notna()')
-                .query('days_diagnosis_to_met > 30') # At least 30 days from first diagnosis to metastatic diagnosis
-                .query('PSADiagnosis.notna()')
-                .query('PSAMetDiagnosis.notna()')
-                .query('PSAMetDiagnosis > PSADiagnosis') # Doubling time formula only makes sense for rising numbers 
-                .query('PSADiagnosis > 0') 
-                .query('PSAMetDiagnosis > 0')  
-                .assign(psa_doubling_diag_met = lambda x: 
-                        ((x['days_diagnosis_to_met']/30) * math.log(2))/
-                        (np.log(x['PSAMetDiagnosis']) - 
-                        np.log(x['PSADiagnosis']))
-                        )
-                [['PatientID', 'psa_doubling_diag_met']]
-            )
-
-            # Calculating PSA velocity with time in months 
-            df_velocity = (
-                df
-                .query('DiagnosisDate.notna()')
-                .query('days_diagnosis_to_met > 30') # At least 30 days from first diagnosis to metastatic diagnosis
-                .query('PSADiagnosis.notna()')
-                .query('PSAMetDiagnosis.notna()')
-                .query('PSADiagnosis > 0') 
-                .query('PSAMetDiagnosis > 0') 
-                .assign(psa_velocity_diag_met = lambda x: (x['PSAMetDiagnosis'] - x['PSADiagnosis']) / (x['days_diagnosis_to_met']/30))
-                [['PatientID', 'psa_velocity_diag_met']]
-            )
+            # Calculating PSA doubling time and velocity in months 
+            psa_doubling, psa_velocity = _psa_kinetics(df['days_diagnosis_to_met'].to_numpy(dtype = np.float64),
+                                                       df['PSADiagnosis'].to_numpy(dtype = np.float64),
+                                                       df['PSAMetDiagnosis'].to_numpy(dtype = np.float64))
 
-            final_df = pd.merge(df, df_doubling, on = 'PatientID', how = 'left')
-            final_df = pd.merge(final_df, df_velocity, on = 'PatientID', how = 'left')
+            # Assign directly rather than merging the metrics back on PatientID
+            df['psa_doubling_diag_met'] = psa_doubling
+            df['psa_velocity_diag_met'] = psa_velocity
 
+            # Drop IsCRPC, plus original stage variables and dates if specified, in a single pass
+            cols_to_drop = ['IsCRPC']
+            if drop_stages:
+                cols_to_drop += ['GroupStage', 'TStage', 'NStage', 'MStage', 'GleasonScore']
             if drop_dates:
-                final_df = final_df.drop(columns = ['MetDiagnosisDate', 'DiagnosisDate', 'CRPCDate'])
+                cols_to_drop += ['MetDiagnosisDate', 'DiagnosisDate', 'CRPCDate']
+            final_df = df.drop(columns = cols_to_drop)
 
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 
@@ -747,7 +849,7 @@ class DataProcessorProstate:
                 race (White, Black or African America, Asian, Other Race)
             - Ethnicity_mod : category
                 ethnicity (Hispanic or Latino, Not Hispanic or Latino)
-            - age : Int64
+            - age : Int16
                 age at index date (index year - birth year)
             - region : category
                 Maps all 50 states, plus DC and Puerto Rico (PR), to a US Census Bureau region
@@ -768,6 +870,7 @@ class DataProcessorProstate:
         Output handling: 
         - Duplicate PatientIDs are logged as warnings if found but retained in output
         - Processed DataFrame is stored in self.demographics_df
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -776,7 +879,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         index_date_df = index_date_df.copy()
@@ -789,63 +892,57 @@ class DataProcessorProstate:
         index_date_column = f'imported_{index_date_column}'
 
         try:
-            df = pd.read_csv(file_path)
+            # Only demographic data for PatientIDs in index_date_df is read into pandas
+            df = read_csv(file_path, patient_ids = index_date_df['PatientID'], cache = self.cache)
             logging.info(f"Successfully read Demographics.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
             # Initial data type conversions
-            df['BirthYear'] = df['BirthYear'].astype('Int64')
+            df['BirthYear'] = df['BirthYear'].astype('Int16')
             df['State'] = df['State'].astype('category')
 
-            index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
+            index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column], cache = True)
 
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df = df[df.PatientID.isin(index_date_df.PatientID)]
-            df = pd.merge(
-                df,
-                index_date_df[['PatientID', index_date_column]], 
-                on = 'PatientID',
-                how = 'left'
-            )
+            # Look up index date by PatientID rather than merging
+            df[index_date_column] = _map_patients(df['PatientID'], index_date_df.set_index('PatientID')[index_date_column])
 
-            df['age'] = df[index_date_column].dt.year - df['BirthYear']
+            df['age'] = df[index_date_column].dt.year.astype('Int16') - df['BirthYear']
 
             # Age validation
             mask_invalid_age = (df['age'] < 18) | (df['age'] > 120)
             if mask_invalid_age.any():
                 logging.warning(f"Found {mask_invalid_age.sum()} ages outside valid range (18-120)")
 
-            # Drop the index date column and BirthYear after age calculation
-            df = df.drop(columns = [index_date_column, 'BirthYear'])
-
             # Race and Ethnicity processing
-            # If Race == 'Hispanic or Latino' and Ethnicity is empty, fill 'Hispanic or Latino' for Ethnicity
-            df['Ethnicity_mod'] = np.where((df['Race'] == 'Hispanic or Latino') & (df['Ethnicity'].isna()), 
-                                            'Hispanic or Latino', 
-                                            df['Ethnicity'])
-
-            # If Race == 'Hispanic or Latino' replace with Nan
-            df['Race_mod'] = np.where(df['Race'] == 'Hispanic or Latino', 
-                                      np.nan, 
-                                      df['Race'])
+            # Compare category codes rather than strings to find Race == 'Hispanic or Latino'
+            race = df['Race'].astype('category')
+            if 'Hispanic or Latino' in race.cat.categories:
+                hispanic_race = race.cat.codes.to_numpy() == race.cat.categories.get_loc('Hispanic or Latino')
+                # If Race == 'Hispanic or Latino' replace with Nan
+                race = race.cat.remove_categories('Hispanic or Latino')
+            else:
+                hispanic_race = np.zeros(len(df), dtype = bool)
 
-            df[['Race_mod', 'Ethnicity_mod']] = df[['Race_mod', 'Ethnicity_mod']].astype('category')
-            df = df.drop(columns = ['Race', 'Ethnicity'])
+            # If Race == 'Hispanic or Latino' and Ethnicity is empty, fill 'Hispanic or Latino' for Ethnicity
+            df['Ethnicity_mod'] = (df['Ethnicity']
+                                   .mask(hispanic_race & df['Ethnicity'].isna().to_numpy(), 'Hispanic or Latino')
+                                   .astype('category'))
+            df['Race_mod'] = race
             
             # Region processing
             # Group states into Census-Bureau regions  
-            df['region'] = (df['State']
-                            .map(self.STATE_REGIONS_MAPPING)
-                            .fillna('unknown')
-                            .astype('category'))
+            df['region'] = _recode_categorical(df['State'], 
+                                               self._REGION_CODES, 
+                                               self.REGION_DTYPE, 
+                                               default_code = self.REGION_DTYPE.categories.get_loc('unknown'))
 
-            # Drop State varibale if specified
+            # Drop the index date column, BirthYear, original Race/Ethnicity, Gender, and State if specified, in a single pass
+            cols_to_drop = [index_date_column, 'BirthYear', 'Race', 'Ethnicity', 'Gender']
             if drop_state:               
-                df = df.drop(columns = ['State'])
-
-            df = df.drop(columns = ['Gender'])
+                cols_to_drop += ['State']
+            df = df.drop(columns = cols_to_drop)
 
             # Check for duplicate PatientIDs
-            if len(df) > df['PatientID'].nunique():
+            if not df['PatientID'].is_unique:
                 duplicate_ids = df[df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
             
@@ -884,6 +981,7 @@ class DataProcessorProstate:
         - PracticeID and PrimaryPhysicianID are removed 
         - Duplicate PatientIDs are logged as warnings if found but retained in output
         - Processed DataFrame is stored in self.practice_df
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if patient_ids is not None:
@@ -891,36 +989,33 @@ class DataProcessorProstate:
                 raise TypeError("patient_ids must be a list or None")
                 
         try:
-            df = pd.read_csv(file_path)
+            # Filter for specific PatientIDs, if provided, while reading
+            df = read_csv(file_path, 
+                          patient_ids = patient_ids, 
+                          usecols = ['PatientID', 'PracticeType'],
+                          cache = self.cache)
             logging.info(f"Successfully read Practice.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
-            # Filter for specific PatientIDs if provided
-            if patient_ids is not None:
-                logging.info(f"Filtering for {len(patient_ids)} specific PatientIDs")
-                df = df[df['PatientID'].isin(patient_ids)]
-                logging.info(f"Successfully filtered Practice.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
-
-            df = df[['PatientID', 'PracticeType']]
-
-            # Group by PatientID and get set of unique PracticeTypes
-            grouped = df.groupby('PatientID')['PracticeType'].unique()
-            grouped_df = pd.DataFrame(grouped).reset_index()
+            # Patients with a single row keep their PracticeType as is; only patients with multiple rows are grouped
+            multiple_rows = df['PatientID'].duplicated(keep = False).to_numpy()
+            final_df = df.loc[~multiple_rows, ['PatientID', 'PracticeType']].rename(columns = {'PracticeType': 'PracticeType_mod'})
 
-            # Function to determine the practice type
-            def get_practice_type(practice_types):
-                if len(practice_types) == 0:
-                    return 'UNKNOWN'
-                if len(practice_types) > 1:
-                    return 'BOTH'
-                return practice_types[0]
-            
-            # Apply the function to the column containing sets
-            grouped_df['PracticeType_mod'] = grouped_df['PracticeType'].apply(get_practice_type).astype('category')
+            if multiple_rows.any():
+                # Group by PatientID and count unique PracticeTypes; BOTH if more than one, otherwise the single PracticeType
+                grouped = df[multiple_rows].groupby('PatientID', sort = False)['PracticeType']
+                grouped_df = pd.DataFrame({
+                    'nunique': grouped.nunique(dropna = False),
+                    'first': grouped.first()
+                })
+                grouped_df['PracticeType_mod'] = np.where(grouped_df['nunique'] > 1, 'BOTH', grouped_df['first'])
+                final_df = pd.concat([final_df, grouped_df[['PracticeType_mod']].reset_index()], ignore_index = True)
 
-            final_df = grouped_df[['PatientID', 'PracticeType_mod']]
+            # Restore one row per PatientID in sorted order, as a groupby over all rows would return
+            final_df = final_df.sort_values('PatientID', ignore_index = True)
+            final_df['PracticeType_mod'] = final_df['PracticeType_mod'].astype('category')
 
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
             
@@ -978,6 +1073,7 @@ class DataProcessorProstate:
         Output handling: 
         - Duplicate PatientIDs are logged as warnings if found but retained in output
         - Processed DataFrame is stored in self.biomarkers_df
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -986,7 +1082,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         if days_before is not None:
@@ -1005,72 +1101,59 @@ class DataProcessorProstate:
         index_date_column = f'imported_{index_date_column}'
 
         try:
-            df = pd.read_csv(file_path)
-            logging.info(f"Successfully read Enhanced_MetPC_Biomarkers.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
-
-            df['ResultDate'] = pd.to_datetime(df['ResultDate'])
-            df['SpecimenReceivedDate'] = pd.to_datetime(df['SpecimenReceivedDate'])
+            # Only biomarker data for PatientIDs in index_date_df is read into pandas, with dates parsed by the reader
+            df = read_csv(file_path, 
+                          patient_ids = index_date_df['PatientID'],
+                          usecols = ['PatientID', 'BiomarkerName', 'BiomarkerStatus', 'ResultDate', 'SpecimenReceivedDate'],
+                          date_cols = ['ResultDate', 'SpecimenReceivedDate'],
+                          categorical_cols = ['PatientID', 'BiomarkerName', 'BiomarkerStatus'],
+                          cache = self.cache)
+            # Categories are exactly the PatientIDs read, so their count is the number of unique PatientIDs without another pass over the rows
+            patients = df['PatientID'].cat.categories
+            logging.info(f"Successfully read Enhanced_MetPC_Biomarkers.csv file with shape: {df.shape} and unique PatientIDs: {len(patients)}")
 
             # Impute missing ResultDate with SpecimenReceivedDate
-            df['ResultDate'] = np.where(df['ResultDate'].isna(), df['SpecimenReceivedDate'], df['ResultDate'])
+            df['ResultDate'] = df['ResultDate'].fillna(df['SpecimenReceivedDate'])
+            df = df.drop(columns = ['SpecimenReceivedDate'])
 
-            index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
+            index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column], cache = True)
 
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df = df[df.PatientID.isin(index_date_df.PatientID)]
-            df = pd.merge(
-                    df,
-                    index_date_df[['PatientID', index_date_column]],
-                    on = 'PatientID',
-                    how = 'left'
-            )
-            logging.info(f"Successfully merged Enhanced_MetPC_Biomarkers.csv df with index_date_df resulting in shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
+            # Look up index date by PatientID rather than merging
+            df[index_date_column] = _map_patients(df['PatientID'], index_date_df.set_index('PatientID')[index_date_column])
+            logging.info(f"Successfully merged Enhanced_MetPC_Biomarkers.csv df with index_date_df resulting in shape: {df.shape} and unique PatientIDs: {len(patients)}")
             
             # Create new variable 'index_to_result' that notes difference in days between resulted specimen and index date
-            df['index_to_result'] = (df['ResultDate'] - df[index_date_column]).dt.days
+            df['index_to_result'] = (df['ResultDate'] - df[index_date_column]).dt.days.astype('Int32')
             
             # Select biomarkers that fall within desired before and after index date
             if days_before is None:
                 # Only filter for days after
-                df_filtered = df[df['index_to_result'] <= days_after].copy()
+                df_filtered = df[df['index_to_result'] <= days_after]
             else:
-                # Filter for both before and after
-                df_filtered = df[
-                    (df['index_to_result'] <= days_after) & 
-                    (df['index_to_result'] >= -days_before)
-                ].copy()
-
-            # Process BRCA
-            positive_values = {
-                'BRCA1 mutation identified',
-                'BRCA2 mutation identified',
-                'Both BRCA1 and BRCA2 mutations identified',
-                'BRCA mutation NOS' 
-            }
-
-            negative_values = {
-                'No BRCA mutation',
-                'Genetic Variant Favor Polymorphism',
-            }
-
-            brca_df = (
-                df_filtered
-                .query('BiomarkerName == "BRCA"')
-                .groupby('PatientID')['BiomarkerStatus']
-                .agg(lambda x: 'positive' if any(val in positive_values for val in x)
-                    else ('negative' if any(val in negative_values for val in x)
-                        else 'unknown'))
-                .reset_index()
-                .rename(columns={'BiomarkerStatus': 'BRCA_status'}) 
+                # Filter for both before and after (inclusive) in a single range check
+                df_filtered = df[df['index_to_result'].between(-days_before, days_after)]
+
+            # Process BRCA: count BRCA tests and positive and negative results per patient, indexed by PatientID categorical code
+            brca = df_filtered.query('BiomarkerName == "BRCA"')
+            codes = brca['PatientID'].cat.codes.to_numpy()
+            n_tests = np.bincount(codes, minlength = len(patients))
+            n_positive = np.bincount(codes[brca['BiomarkerStatus'].isin(self.BRCA_POSITIVE_VALUES).to_numpy()], minlength = len(patients))
+            n_negative = np.bincount(codes[brca['BiomarkerStatus'].isin(self.BRCA_NEGATIVE_VALUES).to_numpy()], minlength = len(patients))
+
+            # Any positive result takes precedence over negative; patients tested with neither are unknown
+            tested = n_tests > 0
+            brca_status = pd.Series(
+                np.where(n_positive[tested] > 0, 'positive',
+                         np.where(n_negative[tested] > 0, 'negative', 'unknown')),
+                index = patients[tested]
             )
 
-            # Merge dataframes -- start with index_date_df to ensure all PatientIDs are included
+            # Start with index_date_df to ensure all PatientIDs are included, then look up BRCA status by PatientID
             final_df = index_date_df[['PatientID']].copy()
-            final_df = pd.merge(final_df, brca_df, on = 'PatientID', how = 'left')
-            final_df['BRCA_status'] = final_df['BRCA_status'].astype('category')
+            final_df['BRCA_status'] = _map_patients(final_df['PatientID'], brca_status).astype('category')
             
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 
@@ -1136,6 +1219,7 @@ class DataProcessorProstate:
         - All PatientIDs from index_date_df are included in the output and values will be NaN for patients without ECOG values
         - Duplicate PatientIDs are logged as warnings if found but retained in output
         - Processed DataFrame is stored in self.ecog_df
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -1144,7 +1228,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         if not isinstance(days_before, int) or days_before < 0:
@@ -1162,82 +1246,71 @@ class DataProcessorProstate:
         index_date_column = f'imported_{index_date_column}'
 
         try:
-            df = pd.read_csv(file_path)
-            logging.info(f"Successfully read ECOG.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
-
-            df['EcogDate'] = pd.to_datetime(df['EcogDate'])
-            df['EcogValue'] = pd.to_numeric(df['EcogValue'], errors = 'coerce').astype('Int64')
-
-            index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
-
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df = df[df.PatientID.isin(index_date_df.PatientID)]
-            df = pd.merge(
-                df,
-                index_date_df[['PatientID', index_date_column]],
-                on = 'PatientID',
-                how = 'left'
-            )
-            logging.info(f"Successfully merged ECOG.csv df with index_date_df resulting in shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
+            # Only ECOGs for PatientIDs in index_date_df are read into pandas, with EcogDate parsed by the reader
+            df = read_csv(file_path, 
+                          patient_ids = index_date_df['PatientID'],
+                          usecols = ['PatientID', 'EcogDate', 'EcogValue'],
+                          date_cols = ['EcogDate'],
+                          categorical_cols = ['PatientID'],
+                          cache = self.cache)
+            # Categories are exactly the PatientIDs read, so their count is the number of unique PatientIDs without another pass over the rows
+            # PatientID categorical codes also number the patients, so per-patient results below are arrays indexed by code
+            patients = df['PatientID'].cat.categories
+            logging.info(f"Successfully read ECOG.csv file with shape: {df.shape} and unique PatientIDs: {len(patients)}")
+
+            # EcogValue is already numeric unless the file holds non-numeric entries, which are coerced to NA
+            df['EcogValue'] = pd.to_numeric(df['EcogValue'], errors = 'coerce').astype('Int16')
+
+            index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column], cache = True)
+
+            # Look up index date by PatientID rather than merging
+            df[index_date_column] = _map_patients(df['PatientID'], index_date_df.set_index('PatientID')[index_date_column])
+            logging.info(f"Successfully merged ECOG.csv df with index_date_df resulting in shape: {df.shape} and unique PatientIDs: {len(patients)}")
                         
             # Create new variable 'index_to_ecog' that notes difference in days between ECOG date and index date
-            df['index_to_ecog'] = (df['EcogDate'] - df[index_date_column]).dt.days
+            df['index_to_ecog'] = (df['EcogDate'] - df[index_date_column]).dt.days.astype('Int32')
             
-            # Select ECOG that fall within desired before and after index date
-            df_closest_window = df[
+            # Filter once to the wider of the two lookback windows; both windows are then taken from this smaller frame
+            df_window = df[
                 (df['index_to_ecog'] <= days_after) & 
-                (df['index_to_ecog'] >= -days_before)].copy()
+                (df['index_to_ecog'] >= -max(days_before, days_before_further))]
+
+            # Select ECOG that fall within desired before and after index date
+            df_closest_window = df_window[df_window['index_to_ecog'] >= -days_before]
 
             # Find EcogValue closest to index date within specified window periods
-            ecog_index_df = (
-                df_closest_window
-                .assign(abs_days_to_index = lambda x: abs(x['index_to_ecog']))
-                .sort_values(
-                    by=['PatientID', 'abs_days_to_index', 'EcogValue'], 
-                    ascending=[True, True, False]) # Last False means highest ECOG is selected in ties 
-                .groupby('PatientID')
-                .first()
-                .reset_index()
-                [['PatientID', 'EcogValue']]
-                .rename(columns = {'EcogValue': 'ecog_index'})
-                .assign(
-                    ecog_index = lambda x: x['ecog_index'].astype(pd.CategoricalDtype(categories = [0, 1, 2, 3, 4], ordered = True))
-                    )
-            )
+            ecog_valid = df_closest_window[df_closest_window['EcogValue'].notna()]
+            ecog_values = ecog_valid['EcogValue'].to_numpy(dtype = np.int64)
+            closest_rows = _closest_ecog_rows(ecog_valid['PatientID'].cat.codes.to_numpy(),
+                                              ecog_valid['index_to_ecog'].to_numpy(dtype = np.int64),
+                                              ecog_values,
+                                              len(patients))
+            # ECOG is taken from the selected row; values outside 0-4 become NaN in the final ECOG_DTYPE cast
+            has_ecog = closest_rows >= 0
+            ecog_index = pd.Series(ecog_values[closest_rows[has_ecog]], index = patients[has_ecog])
             
             # Filter dataframe using farther back window
-            df_progression_window = df[
-                    (df['index_to_ecog'] <= days_after) & 
-                    (df['index_to_ecog'] >= -days_before_further)].copy()
-            
-            # Create flag for ECOG newly greater than or equal to 2
-            ecog_newly_gte2_df = (
-                df_progression_window
-                .sort_values(['PatientID', 'EcogDate']) 
-                .groupby('PatientID')
-                .agg({
-                    'EcogValue': lambda x: (
-                        # 1. Last ECOG is ≥2
-                        (x.iloc[-1] >= 2) and 
-                        # 2. Any previous ECOG was 0 or 1
-                        any(x.iloc[:-1].isin([0, 1]))
-                    )
-                })
-                .reset_index()
-                .rename(columns={'EcogValue': 'ecog_newly_gte2'})
-            )
+            df_progression_window = df_window[df_window['index_to_ecog'] >= -days_before_further]
+            
+            # Create flag for ECOG newly greater than or equal to 2: last ECOG is ≥2 and any previous ECOG was 0 or 1
+            newly_gte2 = _newly_gte2(df_progression_window['PatientID'].cat.codes.to_numpy(),
+                                     df_progression_window['EcogDate'].to_numpy(dtype = 'datetime64[ns]').view('i8'),
+                                     df_progression_window['EcogValue'].to_numpy(dtype = np.int64, na_value = -1),
+                                     len(patients))
+            has_ecog = newly_gte2 >= 0
+            ecog_newly_gte2 = pd.Series(newly_gte2[has_ecog], index = patients[has_ecog])
 
-            # Merge dataframes - start with index_date_df to ensure all PatientIDs are included
+            # Start with index_date_df to ensure all PatientIDs are included, then look up each result by PatientID
             final_df = index_date_df[['PatientID']].copy()
-            final_df = pd.merge(final_df, ecog_index_df, on = 'PatientID', how = 'left')
-            final_df = pd.merge(final_df, ecog_newly_gte2_df, on = 'PatientID', how = 'left')
+            final_df['ecog_index'] = _map_patients(final_df['PatientID'], ecog_index)
+            final_df['ecog_newly_gte2'] = _map_patients(final_df['PatientID'], ecog_newly_gte2)
             
             # Assign datatypes 
-            final_df['ecog_index'] = final_df['ecog_index'].astype(pd.CategoricalDtype(categories=[0, 1, 2, 3, 4], ordered=True))
+            final_df['ecog_index'] = final_df['ecog_index'].astype(self.ECOG_DTYPE)
             final_df['ecog_newly_gte2'] = final_df['ecog_newly_gte2'].astype('Int64')
 
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
                 
@@ -1333,6 +1406,7 @@ class DataProcessorProstate:
         - All PatientIDs from index_date_df are included in the output and values will be NaN for patients without weight, BMI, or percent_change_weight, but set to 0 for hypotension, tachycardia, fevers, and hypoxemia 
         - Duplicate PatientIDs are logged as warnings but retained in output
         - Results are stored in self.vitals_df attribute
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -1341,7 +1415,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         if not isinstance(weight_days_before, int) or weight_days_before < 0:
@@ -1363,16 +1437,15 @@ class DataProcessorProstate:
         index_date_column = f'imported_{index_date_column}'
 
         try:
-            df = pd.read_csv(file_path, low_memory = False)
+            # Only vitals for PatientIDs in index_date_df are read into pandas, with TestDate parsed by the reader
+            df = read_csv(file_path, patient_ids = index_date_df['PatientID'], date_cols = ['TestDate'], cache = self.cache)
             logging.info(f"Successfully read Vitals.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
-            df['TestDate'] = pd.to_datetime(df['TestDate'])
             df['TestResult'] = pd.to_numeric(df['TestResult'], errors = 'coerce').astype('float')
 
             index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
 
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df = df[df.PatientID.isin(index_date_df.PatientID)]
+            # Merge index date on 'left'
             df = pd.merge(
                 df,
                 index_date_df[['PatientID', index_date_column]],
@@ -1570,7 +1643,7 @@ class DataProcessorProstate:
             for col in boolean_columns:
                 final_df[col] = final_df[col].fillna(0).astype('Int64')
             
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset=['PatientID'], keep=False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 
@@ -1658,6 +1731,7 @@ class DataProcessorProstate:
         - All PatientIDs from index_date_df are included in the output and value is set to 0 for those without insurance type 
         - Duplicate PatientIDs are logged as warnings but retained in output
         - Results are stored in self.insurance_df attribute
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -1666,7 +1740,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         if days_before is not None:
@@ -1691,12 +1765,10 @@ class DataProcessorProstate:
         index_date_column = f'imported_{index_date_column}'
 
         try:
-            df = pd.read_csv(file_path)
+            # Only insurance records for PatientIDs in index_date_df are read into pandas, with dates parsed by the reader
+            df = read_csv(file_path, patient_ids = index_date_df['PatientID'], date_cols = ['StartDate', 'EndDate'], cache = self.cache)
             logging.info(f"Successfully read Insurance.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
-            df['StartDate'] = pd.to_datetime(df['StartDate'])
-            df['EndDate'] = pd.to_datetime(df['EndDate'])
-
             both_dates_missing = df['StartDate'].isna() & df['EndDate'].isna()
             start_date_missing = df['StartDate'].isna()
 
@@ -1715,8 +1787,7 @@ class DataProcessorProstate:
 
             index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
 
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df = df[df.PatientID.isin(index_date_df.PatientID)]
+            # Merge index date on 'left'
             df = pd.merge(
                 df,
                 index_date_df[['PatientID', index_date_column]],
@@ -1856,7 +1927,7 @@ class DataProcessorProstate:
             final_df = final_df.drop(columns=hybrid_columns, errors='ignore')
 
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 
@@ -1960,6 +2031,7 @@ class DataProcessorProstate:
         - All PatientIDs from index_date_df are included in the output and values are NaN for patients without lab values 
         - Duplicate PatientIDs are logged as warnings but retained in output 
         - Results are stored in self.labs_df attribute
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -1968,7 +2040,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         if not isinstance(days_before, int) or days_before < 0:
@@ -1998,19 +2070,16 @@ class DataProcessorProstate:
             self.LOINC_MAPPINGS.update(additional_loinc_mappings)
 
         try:
-            df = pd.read_csv(file_path)
+            # Only labs for PatientIDs in index_date_df are read into pandas, with dates parsed by the reader
+            df = read_csv(file_path, patient_ids = index_date_df['PatientID'], date_cols = ['ResultDate', 'TestDate'], cache = self.cache)
             logging.info(f"Successfully read Lab.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
-            df['ResultDate'] = pd.to_datetime(df['ResultDate'])
-            df['TestDate'] = pd.to_datetime(df['TestDate'])
-
             # Impute TestDate for missing ResultDate. 
             df['ResultDate'] = np.where(df['ResultDate'].isna(), df['TestDate'], df['ResultDate'])
 
             index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
 
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df = df[df.PatientID.isin(index_date_df.PatientID)]
+            # Merge index date on 'left'
             df = pd.merge(
                 df,
                 index_date_df[['PatientID', index_date_column]],
@@ -2321,7 +2390,7 @@ class DataProcessorProstate:
             final_df = pd.merge(final_df, psa_doubling_df, on = 'PatientID', how = 'left')
 
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 
@@ -2385,6 +2454,7 @@ class DataProcessorProstate:
         - All PatientIDs from index_date_df are included in the output
         - Duplicate PatientIDs are logged as warnings but retained in output 
         - Results are stored in self.medicines_df attribute
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -2393,7 +2463,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         if not isinstance(days_before, int) or days_before < 0:
@@ -2411,17 +2481,16 @@ class DataProcessorProstate:
         index_date_column = f'imported_{index_date_column}'
 
         try:
-            df = pd.read_csv(file_path)
+            # Only medications for PatientIDs in index_date_df are read into pandas, with AdministeredDate parsed by the reader
+            df = read_csv(file_path, patient_ids = index_date_df['PatientID'], date_cols = ['AdministeredDate'], cache = self.cache)
             logging.info(f"Successfully read MedicationAdministration.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
-            df['AdministeredDate'] = pd.to_datetime(df['AdministeredDate'])
             df['AdministeredAmount'] = df['AdministeredAmount'].astype(float)
             df = df.query('CommonDrugName != "Clinical study drug"')
                                         
             index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
 
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df = df[df.PatientID.isin(index_date_df.PatientID)]
+            # Merge index date on 'left'
             df = pd.merge(
                 df,
                 index_date_df[['PatientID', index_date_column]],
@@ -2585,7 +2654,7 @@ class DataProcessorProstate:
                 final_df[category] = final_df['PatientID'].isin(ids).astype('Int64')
 
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 
@@ -2675,6 +2744,7 @@ class DataProcessorProstate:
         - All PatientIDs from index_date_df are included in the output and values will be set to 0 for patients with misisng Elixhauser comorbidities or metastasis sites, but NaN for missing van_walraven_score
         - Duplicate PatientIDs are logged as warnings but retained in output
         - Results are stored in self.diagnoses_df attribute
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -2683,7 +2753,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         if days_before is not None:
@@ -2702,14 +2772,13 @@ class DataProcessorProstate:
         index_date_column = f'imported_{index_date_column}'
 
         try:
-            df = pd.read_csv(file_path)
+            # Only diagnoses for PatientIDs in index_date_df are read into pandas, with DiagnosisDate parsed by the reader
+            df = read_csv(file_path, patient_ids = index_date_df['PatientID'], date_cols = ['DiagnosisDate'], cache = self.cache)
             logging.info(f"Successfully read Diagnosis.csv file with shape: {df.shape} and unique PatientIDs: {(df['PatientID'].nunique())}")
 
-            df['DiagnosisDate'] = pd.to_datetime(df['DiagnosisDate'])
             index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
 
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df = df[df.PatientID.isin(index_date_df.PatientID)]
+            # Merge index date on 'left'
             df = pd.merge(
                 df,
                 index_date_df[['PatientID', index_date_column]],
@@ -2838,7 +2907,7 @@ class DataProcessorProstate:
             final_df[binary_columns] = final_df[binary_columns].fillna(0).astype('Int64')
 
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset = ['PatientID'], keep = False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 
@@ -2943,7 +3012,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         index_date_df = index_date_df.copy()
@@ -3184,7 +3253,7 @@ class DataProcessorProstate:
                     final_df = final_df.drop(columns=[index_date_column, 'DateOfDeath'])
                 
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset=['PatientID'], keep=False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 
@@ -3229,6 +3298,7 @@ class DataProcessorProstate:
         Output handling: 
         - Duplicate PatientIDs are logged as warnings if found but retained in output
         - Processed DataFrame is stored in self.adt_df
+        - If the processor was created with cache = True, the input file is cached as Parquet next to it (file_path + '.parquet')
         """
         # Input validation
         if not isinstance(index_date_df, pd.DataFrame):
@@ -3237,7 +3307,7 @@ class DataProcessorProstate:
             raise ValueError("index_date_df must contain a 'PatientID' column")
         if not index_date_column or index_date_column not in index_date_df.columns:
             raise ValueError('index_date_column not found in index_date_df')
-        if index_date_df['PatientID'].duplicated().any():
+        if not index_date_df['PatientID'].is_unique:
             raise ValueError("index_date_df contains duplicate PatientID values, which is not allowed")
         
         index_date_df = index_date_df.copy()
@@ -3250,17 +3320,15 @@ class DataProcessorProstate:
         index_date_column = f'imported_{index_date_column}'
 
         try:
-            df_adt = pd.read_csv(file_path)
-            df_adt['StartDate'] = pd.to_datetime(df_adt['StartDate'])
-            df_adt['EndDate'] = pd.to_datetime(df_adt['EndDate'])
+            # Only ADT records for PatientIDs in index_date_df are read into pandas, with dates parsed by the reader
+            df_adt = read_csv(file_path, patient_ids = index_date_df['PatientID'], date_cols = ['StartDate', 'EndDate'], cache = self.cache)
 
             # Impute EndDate for missing StartDate
             df_adt['StartDate'] = np.where(df_adt['StartDate'].isna(), df_adt['EndDate'], df_adt['StartDate'])
 
             index_date_df[index_date_column] = pd.to_datetime(index_date_df[index_date_column])
 
-            # Select PatientIDs that are included in the index_date_df the merge on 'left'
-            df_adt = df_adt[df_adt.PatientID.isin(index_date_df.PatientID)]
+            # Merge index date on 'left'
             df_adt = pd.merge(
                 df_adt,
                 index_date_df[['PatientID', index_date_column]], 
@@ -3283,7 +3351,7 @@ class DataProcessorProstate:
             final_df['ever_received_adt'] = final_df['ever_received_adt'].astype('Int64')
           
             # Check for duplicate PatientIDs
-            if len(final_df) > final_df['PatientID'].nunique():
+            if not final_df['PatientID'].is_unique:
                 duplicate_ids = final_df[final_df.duplicated(subset=['PatientID'], keep=False)]['PatientID'].unique()
                 logging.warning(f"Duplicate PatientIDs found: {duplicate_ids}")
 